@@ -1,15 +1,23 @@
 
 import json
-from datetime import datetime
+import mimetypes
+import os
+import re
+import time
+from contextlib import ExitStack
+from datetime import datetime, timezone
 from functools import wraps
 
-from flask import Flask, render_template, request, redirect, url_for, session, jsonify, g
+from flask import Flask, render_template, request, redirect, url_for, session, jsonify, g, send_from_directory, abort
 from flask_sqlalchemy import SQLAlchemy
 from flask_cors import CORS
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 from werkzeug.security import generate_password_hash, check_password_hash
 from config import Config
+from assets import BUNDLES, DIST_DIR, load_manifest
+from grade_store import GradeStore
+from ratelimit_storage import SQLiteStorage  # noqa: F401 - registers the sqlite:// limiter storage
 from urllib.parse import urlparse, urljoin
 import logging
 
@@ -17,11 +25,14 @@ app = Flask(__name__)
 app.config.from_object(Config)
 
 # Rate Limiter setup
+# the storage options are SQLiteStorage's own; other backends would pass them on to their client
+_ratelimit_uri = app.config['RATELIMIT_STORAGE_URI']
 limiter = Limiter(
     get_remote_address,
     app=app,
     default_limits=["200 per day", "50 per hour"],
-    storage_uri="memory://",
+    storage_uri=_ratelimit_uri,
+    storage_options=app.config['RATELIMIT_STORAGE_OPTIONS'] if urlparse(_ratelimit_uri).scheme == 'sqlite' else {},
 )
 
 # CORS setup
@@ -44,6 +55,42 @@ def is_safe_url(target):
     return test_url.scheme in ('http', 'https') and \
            ref_url.netloc == test_url.netloc
 
+# --- Static assets ---
+# Fingerprinted build output from `python assets.py`; empty in dev, which falls back to /static.
+asset_manifest = load_manifest()
+
+def asset_urls(name):
+    """URLs for a logical asset: the hashed bundle when built, else its source files."""
+    hashed = asset_manifest.get(name)
+    if hashed:
+        return [url_for('asset', filename=hashed)]
+    return [url_for('static', filename=src) for src in BUNDLES.get(name, [name])]
+
+def asset_url(name):
+    return asset_urls(name)[0]
+
+app.jinja_env.globals['asset_url'] = asset_url
+app.jinja_env.globals['asset_urls'] = asset_urls
+
+@app.route('/assets/<path:filename>')
+@limiter.exempt
+def asset(filename):
+    # Hashed filenames never change content, so they can be cached for a year.
+    if filename not in asset_manifest.values():
+        abort(404)
+    mimetype = mimetypes.guess_type(filename)[0]
+    for encoding, suffix in (('br', '.br'), ('gzip', '.gz')):
+        if request.accept_encodings[encoding] and os.path.isfile(os.path.join(DIST_DIR, filename + suffix)):
+            response = send_from_directory(DIST_DIR, filename + suffix, mimetype=mimetype, max_age=app.config['ASSET_MAX_AGE'])
+            response.headers['Content-Encoding'] = encoding
+            break
+    else:
+        response = send_from_directory(DIST_DIR, filename, mimetype=mimetype, max_age=app.config['ASSET_MAX_AGE'])
+    response.vary.add('Accept-Encoding')
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
+
 from sqlalchemy.orm import joinedload, subqueryload
 
 # --- Models ---
@@ -99,16 +146,47 @@ class Comment(db.Model):
 class SubjectGrade(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), index=True)
-    subject = db.Column(db.String(128))
-    units = db.Column(db.Float, default=3.0)
-    grade = db.Column(db.Float)
-    year = db.Column(db.Integer, default=1)  # 1st, 2nd, 3rd, 4th
-    semester = db.Column(db.Integer, default=1)  # 1st, 2nd, Summer
+    # active_history loads the old value even if the attribute was expired before being set,
+    # so the grade history always sees what an update replaced
+    subject = db.mapped_column(db.String(128), active_history=True)
+    units = db.mapped_column(db.Float, default=3.0, active_history=True)
+    grade = db.mapped_column(db.Float, active_history=True)
+    year = db.mapped_column(db.Integer, default=1, active_history=True)  # 1st, 2nd, 3rd, 4th
+    semester = db.mapped_column(db.Integer, default=1, active_history=True)  # 1st, 2nd, Summer
     timestamp = db.Column(db.DateTime, default=datetime.utcnow)
 
     def is_failed(self):
         return self.grade is not None and self.grade > 3.0
 
+# Append-only log of every grade insert/update/delete. Values are the row after the change
+# (before it, for deletes). grade_id is not a foreign key so events outlive the grade.
+class GradeEvent(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, index=True, nullable=False)
+    grade_id = db.Column(db.Integer, index=True, nullable=False)
+    action = db.Column(db.String(8), nullable=False)  # insert, update, delete
+    subject = db.Column(db.String(128))
+    units = db.Column(db.Float)
+    grade = db.Column(db.Float)
+    year = db.Column(db.Integer)
+    semester = db.Column(db.Integer)
+    timestamp = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+# Append-only per-user per-term aggregates: a new row is written whenever a term changes,
+# so the latest row per term is the current state and older rows answer "as of" queries.
+class GradeTermSnapshot(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, nullable=False)
+    year = db.Column(db.Integer, nullable=False)
+    semester = db.Column(db.Integer, nullable=False)
+    units = db.Column(db.Float, nullable=False, default=0.0)  # graded units in the term
+    points = db.Column(db.Float, nullable=False, default=0.0)  # sum(units * grade)
+    subjects = db.Column(db.Integer, nullable=False, default=0)
+    failed = db.Column(db.Integer, nullable=False, default=0)
+    recorded_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (db.Index('ix_grade_term_snapshot_lookup', 'user_id', 'year', 'semester', 'recorded_at'),)
+
 # Simple Admin mapping table so we don't need to alter User schema in-place
 class Admin(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -120,6 +198,423 @@ app.jinja_env.globals['Department'] = Department
 app.jinja_env.globals['Course'] = Course
 app.jinja_env.globals['Admin'] = Admin
 
+# --- Search index ---
+# Inverted index over posts, comments and users: FTS5 on SQLite, tsvector + GIN on Postgres.
+# A document id packs (kind, row id) as ref_id * 4 + kind code, so upserts and deletes go
+# through the primary key / rowid instead of scanning the index.
+from sqlalchemy import and_, bindparam, case, event, func, inspect, select, text
+
+SEARCH_KINDS = {'post': 1, 'comment': 2, 'user': 3}
+SEARCH_MAX_TERMS = 8
+# pg_advisory_xact_lock key serializing the one-time index build across workers
+SEARCH_INDEX_LOCK = 0x67777366
+
+def _search_doc_id(kind, ref_id):
+    return ref_id * 4 + SEARCH_KINDS[kind]
+
+def _search_document(obj):
+    """Returns (kind, body) for an indexable model instance, or None."""
+    if isinstance(obj, Post):
+        return 'post', obj.content
+    if isinstance(obj, Comment):
+        return 'comment', obj.content
+    if isinstance(obj, User):
+        return 'user', ' '.join(filter(None, [obj.name, obj.school_id, obj.department, obj.course]))
+    return None
+
+def _search_is_pg(bind):
+    return bind.dialect.name == 'postgresql'
+
+def _search_table(bind):
+    return 'search_document' if _search_is_pg(bind) else 'search_fts'
+
+def _lock_for_setup(conn, key):
+    # Every worker sets up the derived tables at boot: hold a write lock for the whole
+    # check-and-build so one worker does it and the rest wait, then find it done.
+    if _search_is_pg(conn):
+        conn.execute(text('SELECT pg_advisory_xact_lock(:key)'), {'key': key})
+    else:
+        conn.exec_driver_sql('BEGIN IMMEDIATE')
+
+# derived tables seen to exist in this process; the flush hooks skip their writes until then
+_existing_tables = set()
+
+def _table_exists(conn, table):
+    if table not in _existing_tables and inspect(conn).has_table(table):
+        _existing_tables.add(table)
+    return table in _existing_tables
+
+def _search_write(conn, upserts, deletes):
+    if _search_is_pg(conn):
+        if deletes:
+            conn.execute(text('DELETE FROM search_document WHERE id = :id'), [{'id': d} for d in deletes])
+        if upserts:
+            conn.execute(text(
+                "INSERT INTO search_document (id, tsv) VALUES (:id, to_tsvector('simple', :body)) "
+                "ON CONFLICT (id) DO UPDATE SET tsv = EXCLUDED.tsv"
+            ), [{'id': d, 'body': b} for d, b in upserts.items()])
+        return
+    stale = list(deletes) + list(upserts)
+    if stale:
+        conn.execute(text('DELETE FROM search_fts WHERE rowid = :id'), [{'id': d} for d in stale])
+    if upserts:
+        conn.execute(text('INSERT INTO search_fts (rowid, body) VALUES (:id, :body)'),
+                     [{'id': d, 'body': b} for d, b in upserts.items()])
+
+def ensure_search_index(rebuild=False):
+    """Creates the search index if it is missing and backfills it from existing rows.
+
+    Serialized across workers, so only the first one builds the index and the rest find
+    it done. Returns False when the application tables do not exist yet (run init_db.py first).
+    """
+    conn = db.session.connection()
+    if not inspect(conn).has_table(Post.__tablename__):
+        return False
+    _lock_for_setup(conn, SEARCH_INDEX_LOCK)
+    table = _search_table(conn)
+    if rebuild:
+        conn.execute(text(f'DROP TABLE IF EXISTS {table}'))
+    exists = inspect(conn).has_table(table)
+    if _search_is_pg(conn):
+        conn.execute(text('CREATE TABLE IF NOT EXISTS search_document (id BIGINT PRIMARY KEY, tsv TSVECTOR NOT NULL)'))
+        conn.execute(text('CREATE INDEX IF NOT EXISTS ix_search_document_tsv ON search_document USING GIN (tsv)'))
+    else:
+        conn.execute(text(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS search_fts USING fts5("
+            "body, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+        ))
+    if not exists:
+        for model in (Post, Comment, User):
+            upserts = {}
+            for obj in model.query.yield_per(500):
+                kind, body = _search_document(obj)
+                upserts[_search_doc_id(kind, obj.id)] = body or ''
+            _search_write(conn, upserts, ())
+    db.session.commit()
+    return True
+
+@event.listens_for(db.session, 'after_flush')
+def _sync_search_index(session, flush_context):
+    # Runs inside the flush transaction, so the index commits or rolls back with the rows.
+    # Before the index exists there is nowhere to write; ensure_search_index backfills it.
+    upserts, deletes = {}, set()
+    for obj in session.new | session.dirty:
+        doc = _search_document(obj)
+        if doc and (obj in session.new or session.is_modified(obj, include_collections=False)):
+            upserts[_search_doc_id(doc[0], obj.id)] = doc[1] or ''
+    for obj in session.deleted:
+        doc = _search_document(obj)
+        if doc:
+            deletes.add(_search_doc_id(doc[0], obj.id))
+    if upserts or deletes:
+        conn = session.connection()
+        if _table_exists(conn, _search_table(conn)):
+            _search_write(conn, upserts, deletes)
+
+def search_documents(query, kinds, limit, offset=0):
+    """Ranked prefix search. Returns [(kind, ref_id, rank)], best match first."""
+    terms = re.findall(r'[^\W_]+', query.lower())[:SEARCH_MAX_TERMS]
+    if not terms or not kinds:
+        return []
+    conn = db.session.connection()
+    if _search_is_pg(conn):
+        sql = (
+            "SELECT id, ts_rank(tsv, q) AS rank FROM search_document, to_tsquery('simple', :q) AS q "
+            "WHERE tsv @@ q AND id % 4 IN :codes ORDER BY rank DESC, id DESC LIMIT :limit OFFSET :offset"
+        )
+        q = ' & '.join(f'{t}:*' for t in terms)
+    else:
+        sql = (
+            "SELECT rowid AS id, -bm25(search_fts) AS rank FROM search_fts "
+            "WHERE search_fts MATCH :q AND rowid % 4 IN :codes ORDER BY rank DESC, rowid DESC LIMIT :limit OFFSET :offset"
+        )
+        q = ' '.join(f'"{t}"*' for t in terms)
+    stmt = text(sql).bindparams(bindparam('codes', expanding=True))
+    rows = conn.execute(stmt, {'q': q, 'codes': [SEARCH_KINDS[k] for k in kinds], 'limit': limit, 'offset': offset})
+    kind_by_code = {code: kind for kind, code in SEARCH_KINDS.items()}
+    return [(kind_by_code[r.id % 4], r.id // 4, float(r.rank)) for r in rows]
+
+# --- Grade history ---
+# Every SubjectGrade change appends a GradeEvent plus a GradeTermSnapshot for each affected
+# term, in the same flush. Snapshot ids grow in recording order, so the highest id per term
+# is that term's latest state.
+GRADE_FIELDS = ('subject', 'units', 'grade', 'year', 'semester')
+# pg_advisory_xact_lock key serializing the one-time history seed across workers
+GRADE_HISTORY_SEED_LOCK = 0x67776168
+# pg_advisory_xact_lock(namespace, user_id) serializing one user's snapshot writes
+GRADE_HISTORY_USER_LOCK = 0x67776875
+
+def _grade_values(obj, previous=False):
+    """A SubjectGrade's tracked fields, optionally as they were before the current flush."""
+    state = inspect(obj)
+    values = []
+    for attr in GRADE_FIELDS:
+        value = getattr(obj, attr)
+        if previous:
+            deleted = state.attrs[attr].history.deleted
+            if deleted:
+                value = deleted[0]
+        values.append(value)
+    return tuple(values)
+
+def _add_term_totals(totals, user_id, values, sign):
+    # totals[(user_id, year, semester)] = [units, points, subjects, failed]
+    subject, units, grade, year, semester = values
+    t = totals.setdefault((user_id, year, semester), [0.0, 0.0, 0, 0])
+    if units is not None and grade is not None:
+        t[0] += sign * units
+        t[1] += sign * units * grade
+    t[2] += sign
+    if grade is not None and grade > 3.0:
+        t[3] += sign
+    return t
+
+def _snapshot_row(key, totals, recorded_at):
+    user_id, year, semester = key
+    units, points, subjects, failed = totals
+    return {'user_id': user_id, 'year': year, 'semester': semester, 'units': round(units, 6),
+            'points': round(points, 6), 'subjects': subjects, 'failed': failed, 'recorded_at': recorded_at}
+
+def _term_totals(conn, user_ids):
+    """{(user_id, year, semester): (units, points, subjects, failed)} recounted from subject_grade."""
+    sg = SubjectGrade.__table__
+    graded = and_(sg.c.units.isnot(None), sg.c.grade.isnot(None))
+    rows = conn.execute(
+        select(
+            sg.c.user_id, sg.c.year, sg.c.semester,
+            func.sum(case((graded, sg.c.units), else_=0.0)),
+            func.sum(case((graded, sg.c.units * sg.c.grade), else_=0.0)),
+            func.count(sg.c.id),
+            func.sum(case((sg.c.grade > 3.0, 1), else_=0)),
+        ).where(sg.c.user_id.in_(user_ids)).group_by(sg.c.user_id, sg.c.year, sg.c.semester)
+    )
+    return {(r[0], r[1], r[2]): tuple(r[3:]) for r in rows}
+
+def _event_row(action, obj, values, timestamp):
+    return {'user_id': obj.user_id, 'grade_id': obj.id, 'action': action, 'timestamp': timestamp,
+            **dict(zip(GRADE_FIELDS, values))}
+
+@event.listens_for(db.session, 'after_flush')
+def _record_grade_history(session, flush_context):
+    now = datetime.utcnow()
+    events, deltas = [], {}
+    for obj in session.new:
+        if isinstance(obj, SubjectGrade):
+            values = _grade_values(obj)
+            events.append(_event_row('insert', obj, values, now))
+            _add_term_totals(deltas, obj.user_id, values, 1)
+    for obj in session.dirty:
+        if isinstance(obj, SubjectGrade) and session.is_modified(obj, include_collections=False):
+            old, new = _grade_values(obj, previous=True), _grade_values(obj)
+            if old == new:
+                continue
+            events.append(_event_row('update', obj, new, now))
+            _add_term_totals(deltas, obj.user_id, old, -1)
+            _add_term_totals(deltas, obj.user_id, new, 1)
+    for obj in session.deleted:
+        if isinstance(obj, SubjectGrade):
+            values = _grade_values(obj, previous=True)
+            events.append(_event_row('delete', obj, values, now))
+            _add_term_totals(deltas, obj.user_id, values, -1)
+    if not events:
+        return
+
+    conn = session.connection()
+    # before the history tables exist there is nowhere to write; ensure_grade_history seeds them
+    if not (_table_exists(conn, GradeEvent.__tablename__) and _table_exists(conn, GradeTermSnapshot.__tablename__)):
+        return
+    conn.execute(GradeEvent.__table__.insert(), events)
+    keys = [key for key, delta in deltas.items() if any(delta)]
+    if not keys:
+        return
+    # Snapshots are recounted from subject_grade rather than built as previous snapshot + delta,
+    # so concurrent writers can't lose each other's changes. On Postgres, writers for the same
+    # user also queue on an advisory lock (taken in user order) so each recount sees the
+    # previous writer's commit; SQLite already serializes writers.
+    user_ids = sorted({key[0] for key in keys})
+    if _search_is_pg(conn):
+        for user_id in user_ids:
+            conn.execute(text('SELECT pg_advisory_xact_lock(:ns, :user_id)'),
+                         {'ns': GRADE_HISTORY_USER_LOCK, 'user_id': user_id})
+    totals = _term_totals(conn, user_ids)
+    conn.execute(GradeTermSnapshot.__table__.insert(),
+                 [_snapshot_row(key, totals.get(key, (0.0, 0.0, 0, 0)), now) for key in keys])
+
+def ensure_grade_history():
+    """Creates the grade history tables if missing and seeds them from current grades.
+
+    Grades that predate the history are replayed as inserts at their own timestamps
+    (or the seed time, for grades without one).
+    Returns False when the application tables do not exist yet (run init_db.py first).
+    """
+    conn = db.session.connection()
+    if not inspect(conn).has_table(SubjectGrade.__tablename__):
+        return False
+    _lock_for_setup(conn, GRADE_HISTORY_SEED_LOCK)
+    GradeEvent.__table__.create(conn, checkfirst=True)
+    GradeTermSnapshot.__table__.create(conn, checkfirst=True)
+    if db.session.query(GradeEvent.id).first() is None:
+        events, snapshots, totals = [], [], {}
+        now = datetime.utcnow()
+        grades = SubjectGrade.query.order_by(
+            SubjectGrade.user_id, SubjectGrade.timestamp.asc().nulls_last(), SubjectGrade.id
+        ).all()
+        for grade in grades:
+            # timestamp is nullable; undated grades are recorded as of the seed
+            timestamp = grade.timestamp or now
+            values = _grade_values(grade)
+            events.append(_event_row('insert', grade, values, timestamp))
+            t = _add_term_totals(totals, grade.user_id, values, 1)
+            snapshots.append(_snapshot_row((grade.user_id, grade.year, grade.semester), t, timestamp))
+        if events:
+            conn.execute(GradeEvent.__table__.insert(), events)
+            conn.execute(GradeTermSnapshot.__table__.insert(), snapshots)
+    db.session.commit()
+    return True
+
+def latest_term_snapshots(user_id, as_of=None):
+    """Each term's latest snapshot (recorded at or before `as_of`), in term order."""
+    latest = db.session.query(func.max(GradeTermSnapshot.id)).filter(GradeTermSnapshot.user_id == user_id)
+    if as_of is not None:
+        latest = latest.filter(GradeTermSnapshot.recorded_at <= as_of)
+    latest = latest.group_by(GradeTermSnapshot.year, GradeTermSnapshot.semester)
+    return GradeTermSnapshot.query.filter(GradeTermSnapshot.id.in_(latest)).order_by(
+        GradeTermSnapshot.year, GradeTermSnapshot.semester
+    ).all()
+
+def gwa_by_term(user_id, as_of=None):
+    """Term GWA, cumulative GWA and term-over-term delta for each term with grades."""
+    terms = []
+    total_units = 0
+    total_points = 0
+    prev_gwa = None
+    for snap in latest_term_snapshots(user_id, as_of):
+        if snap.subjects <= 0:
+            continue
+        total_units += snap.units
+        total_points += snap.points
+        term_gwa = round(snap.points/snap.units,3) if snap.units>0 else None
+        terms.append({
+            'year': snap.year, 'semester': snap.semester, 'units': snap.units, 'subjects': snap.subjects,
+            'failed': snap.failed, 'gwa': term_gwa,
+            'cumulative_gwa': round(total_points/total_units,3) if total_units>0 else None,
+            'delta': round(term_gwa - prev_gwa,3) if term_gwa is not None and prev_gwa is not None else None,
+            'updated_at': snap.recorded_at.isoformat(),
+        })
+        if term_gwa is not None:
+            prev_gwa = term_gwa
+    return terms
+
+def gwa_timeline(user_id, full_history=False, terms=None):
+    """Cumulative GWA as [{year, semester, timestamp, gwa}].
+
+    By default one point per term, in term order and stamped with the term's last change,
+    built from the latest snapshot per term (pass `terms` from gwa_by_term to reuse them);
+    label these by term, since edit times need not follow term order. full_history replays
+    every snapshot instead, one point per grade change in time order, tagged with the term
+    it changed; that grows with the user's edit history, so keep it off for per-page-view payloads.
+    """
+    if not full_history:
+        if terms is None:
+            terms = gwa_by_term(user_id)
+        return [{'year': t['year'], 'semester': t['semester'], 'timestamp': t['updated_at'], 'gwa': t['cumulative_gwa']}
+                for t in terms]
+    snaps = GradeTermSnapshot.query.filter_by(user_id=user_id).order_by(GradeTermSnapshot.id).all()
+    current = {}
+    total_units = 0
+    total_points = 0
+    timeline = []
+    for snap in snaps:
+        old = current.get((snap.year, snap.semester))
+        if old is not None:
+            total_units -= old.units
+            total_points -= old.points
+        current[(snap.year, snap.semester)] = snap
+        total_units += snap.units
+        total_points += snap.points
+        gwa = round(total_points/total_units,3) if total_units>1e-9 else None
+        timestamp = snap.recorded_at.isoformat()
+        # snapshots written by one change share a timestamp; keep the final value
+        if timeline and timeline[-1]['timestamp'] == timestamp:
+            timeline[-1]['gwa'] = gwa
+        else:
+            timeline.append({'year': snap.year, 'semester': snap.semester, 'timestamp': timestamp, 'gwa': gwa})
+    return timeline
+
+# --- Columnar grade store ---
+# Per-worker array-backed copy of all grades for global analytics. Loaded once, then kept
+# current by replaying GradeEvents: each refresh re-reads a trailing window of events so ones
+# committed out of id order are still applied, and a periodic full reload catches anything
+# older than that.
+grade_store = GradeStore()
+
+def refresh_grade_store():
+    """Brings this worker's grade_store up to date. Call with grade_store.lock held."""
+    now = time.monotonic()
+    if grade_store.loaded_at is None or now - grade_store.loaded_at > app.config['GRADE_STORE_RELOAD_SECONDS']:
+        last_event_id = db.session.query(func.max(GradeEvent.id)).scalar() or 0
+        rows = db.session.query(
+            SubjectGrade.id, SubjectGrade.user_id, SubjectGrade.subject, SubjectGrade.units,
+            SubjectGrade.grade, SubjectGrade.year, SubjectGrade.semester
+        ).order_by(SubjectGrade.id).yield_per(5000)
+        grade_store.load(rows, last_event_id, now)
+    else:
+        events = db.session.query(
+            GradeEvent.id, GradeEvent.action, GradeEvent.grade_id, GradeEvent.user_id, GradeEvent.subject,
+            GradeEvent.units, GradeEvent.grade, GradeEvent.year, GradeEvent.semester
+        ).filter(
+            GradeEvent.id > grade_store.replay_floor(now, app.config['GRADE_STORE_EVENT_WINDOW_SECONDS'])
+        ).order_by(GradeEvent.id).all()
+        grade_store.apply_events(events, now)
+    return grade_store
+
+_derived_tables_ready = False
+_derived_tables_retry_at = 0.0
+# seconds to wait before retrying a failed search index / grade history setup
+DERIVED_TABLES_RETRY_SECONDS = 60
+
+@app.before_request
+def _ensure_derived_tables_once():
+    # Search and grade history are extras: if setting them up fails, log it and keep serving
+    # every other route, with those features answering 503 until a later retry succeeds.
+    global _derived_tables_ready, _derived_tables_retry_at
+    if _derived_tables_ready or time.monotonic() < _derived_tables_retry_at:
+        return
+    try:
+        _derived_tables_ready = ensure_search_index() and ensure_grade_history()
+    except Exception as e:
+        db.session.rollback()
+        _derived_tables_retry_at = time.monotonic() + DERIVED_TABLES_RETRY_SECONDS
+        logging.error(f"Search index / grade history setup failed: {e}")
+
+def derived_tables_unavailable():
+    return jsonify({'error': 'Search and grade history are temporarily unavailable.'}), 503
+
+# --- Worker warmup ---
+def warmup():
+    """Opens pool connections and primes per-worker caches before a worker takes traffic.
+
+    Called from gunicorn.conf.py when WARMUP_ON_START is set. Failures are logged, not
+    raised, so a cold database never stops a worker from booting.
+    """
+    global _derived_tables_ready
+    with app.app_context():
+        try:
+            # hold several connections at once so the pool really opens (and TLS-handshakes) each;
+            # the ExitStack returns every one already opened even if a later connect fails
+            with ExitStack() as stack:
+                for _ in range(app.config['WARMUP_POOL_CONNECTIONS']):
+                    stack.enter_context(db.engine.connect()).execute(text('SELECT 1'))
+            _derived_tables_ready = ensure_search_index() and ensure_grade_history()
+            if _derived_tables_ready:
+                catalog()
+                with grade_store.lock:
+                    refresh_grade_store()
+        except Exception as e:
+            logging.error(f"Warmup failed: {e}")
+        finally:
+            db.session.remove()
+
 # --- Auth helpers ---
 def login_required(f):
     @wraps(f)
@@ -146,24 +641,31 @@ def admin_required(f):
         return f(*args, **kwargs)
     return decorated_function
 
+def can_view_grades(user_id):
+    """Students may read their own grade history; admins may read anyone's."""
+    return user_id == session.get('user_id') or Admin.query.filter_by(user_id=session.get('user_id')).first() is not None
+
 # --- Utility functions ---
-def compute_gwa_for_user(user_id):
-    grades = SubjectGrade.query.filter_by(user_id=user_id).all()
+def compute_gwa_for_user(user_id, grades=None):
+    if grades is None:
+        grades = SubjectGrade.query.filter_by(user_id=user_id).all()
     total_units = sum(g.units for g in grades if g.units is not None and g.grade is not None)
     if total_units == 0:
         return None
     total = sum(g.units * g.grade for g in grades if g.units is not None and g.grade is not None)
     return round(total / total_units, 3)
 
-def analyze_latin_honors(user_id):
+def analyze_latin_honors(user_id, grades=None):
     """
     Analyzes Latin Honors eligibility based on CTU standards:
     - Summa: 1.00 - 1.20
     - Magna: 1.21 - 1.45
     - Cum Laude: 1.46 - 1.75
     - Requirements: No failing grades (>3.0), no grade below 2.5, full load per semester
+    Pass preloaded `grades` to avoid re-querying them.
     """
-    grades = SubjectGrade.query.filter_by(user_id=user_id).all()
+    if grades is None:
+        grades = SubjectGrade.query.filter_by(user_id=user_id).all()
     if not grades:
         return {"eligible": False, "reason": "No grades recorded", "title": None}
 
@@ -229,6 +731,59 @@ def analyze_latin_honors(user_id):
     else:
         return {"eligible": False, "reason": "GWA does not meet honors cutoff", "title": None, "gwa": gwa, "status": status}
 
+def grade_to_dict(g):
+    return {'id': g.id, 'subject': g.subject, 'units': g.units, 'grade': g.grade, 'year': g.year, 'semester': g.semester, 'failed': g.is_failed()}
+
+def feed_page(limit=100):
+    """Latest posts with author, reaction summary and comments, loaded in three queries."""
+    posts = Post.query.options(
+        joinedload(Post.author),
+        subqueryload(Post.reactions),
+        subqueryload(Post.comments).joinedload(Comment.author)
+    ).order_by(Post.timestamp.desc()).limit(limit).all()
+
+    data = []
+    for p in posts:
+        # build reaction summary by type
+        r_summary = {}
+        for r in p.reactions:
+            r_summary[r.type] = r_summary.get(r.type, 0) + 1
+        data.append({
+            'id': p.id,
+            'content': p.content,
+            'author': p.author.name,
+            'author_id': p.author.id,
+            'timestamp': p.timestamp.isoformat(),
+            'reactions': r_summary,
+            'comments': [{'id': c.id, 'user': (c.author.name if c.author else "Unknown"), 'content': c.content, 'timestamp': c.timestamp.isoformat()} for c in p.comments]
+        })
+    return data
+
+_catalog_cache = (0.0, None)
+
+def catalog():
+    """Departments with their courses. Cached per worker: they only change through init_db.py."""
+    global _catalog_cache
+    loaded_at, data = _catalog_cache
+    if data is None or time.monotonic() - loaded_at > app.config['CATALOG_CACHE_SECONDS']:
+        departments = Department.query.options(subqueryload(Department.courses)).order_by(Department.name).all()
+        data = [{'id': d.id, 'name': d.name, 'courses': [{'id': c.id, 'name': c.name} for c in d.courses]} for d in departments]
+        _catalog_cache = (time.monotonic(), data)
+    return data
+
+def dashboard_bootstrap(user):
+    """Everything the dashboard needs on load, with each query run once."""
+    grades = SubjectGrade.query.filter_by(user_id=user.id).all()
+    return {
+        'user': {'id': user.id, 'name': user.name, 'school_id': user.school_id, 'department': user.department, 'course': user.course},
+        'grades': [grade_to_dict(g) for g in grades],
+        'gwa': compute_gwa_for_user(user.id, grades),
+        'honors': analyze_latin_honors(user.id, grades),
+        'timeline': gwa_timeline(user.id) if _derived_tables_ready else [],
+        'catalog': catalog(),
+        'feed': feed_page(),
+    }
+
 # --- Error Handlers ---
 @app.errorhandler(429)
 def ratelimit_handler(e):
@@ -296,55 +851,23 @@ def logout():
 @app.route('/dashboard')
 @login_required
 def dashboard():
-    # Eager load relationships that are needed in the template
-    user = User.query.options(
-        subqueryload(User.grades)
-    ).get(session['user_id'])
-    
-    departments = Department.query.all()
-    
-    # Eager load author for posts in dashboard
-    posts = Post.query.options(
-        joinedload(Post.author)
-    ).order_by(Post.timestamp.desc()).limit(50).all()
-    
-    # We can use the pre-loaded user.grades here
-    grades = user.grades
-    
-    # Optimization: calculate GWA once
-    gwa = compute_gwa_for_user(user.id)
-    honors = analyze_latin_honors(user.id)
-    
-    return render_template('dashboard.html', user=user, departments=departments, posts=posts, grades=grades, gwa=gwa, honors=honors)
+    user = db.session.get(User, session['user_id'])
+    # Embedded in the page so main.js renders the feed and chart without refetching
+    bootstrap = dashboard_bootstrap(user)
+    return render_template('dashboard.html', user=user, grades=bootstrap['grades'], gwa=bootstrap['gwa'], honors=bootstrap['honors'], bootstrap=bootstrap)
+
+@app.route('/api/bootstrap', methods=['GET'])
+@login_required
+def api_bootstrap():
+    user = db.session.get(User, session['user_id'])
+    return jsonify(dashboard_bootstrap(user))
 
 # API: posts
 @app.route('/api/posts', methods=['GET','POST'])
 @login_required
 def api_posts():
     if request.method == 'GET':
-        # Optimize with joinedload for author and subqueryload for comments/reactions
-        posts = Post.query.options(
-            joinedload(Post.author),
-            subqueryload(Post.reactions),
-            subqueryload(Post.comments).joinedload(Comment.author)
-        ).order_by(Post.timestamp.desc()).limit(100).all()
-        
-        data = []
-        for p in posts:
-            # build reaction summary by type
-            r_summary = {}
-            for r in p.reactions:
-                r_summary[r.type] = r_summary.get(r.type, 0) + 1
-            data.append({
-                'id': p.id,
-                'content': p.content,
-                'author': p.author.name,
-                'author_id': p.author.id,
-                'timestamp': p.timestamp.isoformat(),
-                'reactions': r_summary,
-                'comments': [{'id': c.id, 'user': (c.author.name if c.author else "Unknown"), 'content': c.content, 'timestamp': c.timestamp.isoformat()} for c in p.comments]
-            })
-        return jsonify(data)
+        return jsonify(feed_page())
 
     # POST create
     payload = request.get_json()
@@ -412,7 +935,7 @@ def api_grades():
     user_id = session['user_id']
     if request.method == 'GET':
         grades = SubjectGrade.query.filter_by(user_id=user_id).all()
-        return jsonify([{'id': g.id, 'subject': g.subject, 'units': g.units, 'grade': g.grade, 'year': g.year, 'semester': g.semester, 'failed': g.is_failed()} for g in grades])
+        return jsonify([grade_to_dict(g) for g in grades])
     payload = request.get_json()
     subject = payload.get('subject','').strip()
     try:
@@ -429,6 +952,8 @@ def api_grades():
         return jsonify({'error':'Grade must be between 1.0 (highest) and 5.0 (lowest)'}), 400
     if units <= 0:
         return jsonify({'error':'Units must be positive'}), 400
+    if not (1 <= year <= 5) or not (1 <= semester <= 3):
+        return jsonify({'error':'Year must be 1 to 5 and semester 1, 2 or 3 (Summer)'}), 400
     # Auto-post achievement if GWA improved significantly
     old_gwa = compute_gwa_for_user(user_id)
     
@@ -461,8 +986,10 @@ def api_update_grade(grade_id):
     try:
         units = float(payload.get('units', g.units))
         grade_val = float(payload.get('grade', g.grade))
+        year = int(payload.get('year', g.year))
+        semester = int(payload.get('semester', g.semester))
     except (TypeError, ValueError):
-        return jsonify({'error':'Units and grade must be numeric'}), 400
+        return jsonify({'error':'Units, grade, year, and semester must be numeric'}), 400
     # validate
     if not subject:
         return jsonify({'error':'Subject required'}), 400
@@ -470,11 +997,13 @@ def api_update_grade(grade_id):
         return jsonify({'error':'Grade must be between 1.0 (highest) and 5.0 (lowest)'}), 400
     if units <= 0:
         return jsonify({'error':'Units must be positive'}), 400
+    if not (1 <= year <= 5) or not (1 <= semester <= 3):
+        return jsonify({'error':'Year must be 1 to 5 and semester 1, 2 or 3 (Summer)'}), 400
     g.subject = subject
     g.units = units
     g.grade = grade_val
-    g.year = int(payload.get('year', g.year))
-    g.semester = int(payload.get('semester', g.semester))
+    g.year = year
+    g.semester = semester
     g.timestamp = datetime.utcnow()
     db.session.commit()
     gwa = compute_gwa_for_user(u_id)
@@ -485,24 +1014,11 @@ def api_update_grade(grade_id):
 @app.route('/api/analytics', methods=['GET'])
 @login_required
 def api_analytics():
-    # summary analytics - optimized with joinedload
-    users = User.query.options(subqueryload(User.grades)).all()
-    gwas = []
-    total_subjects = 0
-    failed_subjects = 0
-    for u in users:
-        total_subjects += len(u.grades)
-        failed_subjects += sum(1 for g in u.grades if g.grade > 3.0)
-        
-        # Calculate GWA from pre-loaded grades
-        total_u_units = sum(g.units for g in u.grades if g.units and g.grade)
-        if total_u_units > 0:
-            total_points = sum(g.units * g.grade for g in u.grades if g.units and g.grade)
-            gwas.append(round(total_points / total_u_units, 3))
-            
-    avg_gwa = round(sum(gwas)/len(gwas),3) if gwas else None
-    fail_rate = (failed_subjects/total_subjects) if total_subjects>0 else None
-    return jsonify({'average_gwa': avg_gwa, 'failure_rate': fail_rate})
+    # summary analytics from the in-memory columnar grade store
+    if not _derived_tables_ready:
+        return derived_tables_unavailable()
+    with grade_store.lock:
+        return jsonify(refresh_grade_store().summary())
 
 @app.route('/api/analytics/department_avg', methods=['GET'])
 @login_required
@@ -524,33 +1040,98 @@ def api_dept_avg():
 @login_required
 def api_failure_rates():
     # failure rates per subject name
-    subjects = db.session.query(SubjectGrade.subject).distinct().all()
-    out = {}
-    for s in subjects:
-        name = s[0]
-        total = SubjectGrade.query.filter_by(subject=name).count()
-        failed = SubjectGrade.query.filter_by(subject=name).filter(SubjectGrade.grade>3.0).count()
-        out[name] = {'total': total, 'failed': failed, 'failure_rate': round((failed/total),3) if total>0 else None}
-    return jsonify(out)
+    if not _derived_tables_ready:
+        return derived_tables_unavailable()
+    with grade_store.lock:
+        return jsonify(refresh_grade_store().failure_rates())
 
 @app.route('/api/analytics/gwa_trends', methods=['GET'])
 @login_required
 def api_gwa_trends():
-    # return GWA over time for a user (pass user_id as param) as list of {timestamp, gwa}
+    # return GWA over time for a user (pass user_id as param) as list of {year, semester, timestamp, gwa}
     user_id = request.args.get('user_id', type=int)
     if not user_id:
         return jsonify({'error':'user_id query parameter required (e.g. ?user_id=1)'}), 400
-    grades = SubjectGrade.query.filter_by(user_id=user_id).order_by(SubjectGrade.timestamp.asc()).all()
-    timeline = []
-    # accumulate and compute GWA at each grade timestamp
-    accumulated = []
-    for g in grades:
-        accumulated.append(g)
-        total_units = sum(item.units for item in accumulated)
-        total_points = sum(item.units * item.grade for item in accumulated)
-        gwa = round(total_points/total_units,3) if total_units>0 else None
-        timeline.append({'timestamp': g.timestamp.isoformat(), 'gwa': gwa})
-    return jsonify({'user_id': user_id, 'timeline': timeline})
+    if not can_view_grades(user_id):
+        return jsonify({'error':'Not allowed to view this student\'s grades'}), 403
+    # ?history=1 returns one timeline point per grade change instead of one per term
+    full_history = request.args.get('history', '').lower() in ('1', 'true', 'yes')
+    if not _derived_tables_ready:
+        return derived_tables_unavailable()
+    terms = gwa_by_term(user_id)
+    return jsonify({'user_id': user_id, 'timeline': gwa_timeline(user_id, full_history, terms), 'terms': terms})
+
+@app.route('/api/analytics/gwa_as_of', methods=['GET'])
+@login_required
+def api_gwa_as_of():
+    # point-in-time GWA from term snapshots (pass user_id and an ISO date or datetime as as_of)
+    user_id = request.args.get('user_id', type=int)
+    as_of_raw = request.args.get('as_of', '')
+    if not user_id:
+        return jsonify({'error':'user_id query parameter required (e.g. ?user_id=1&as_of=2026-01-31)'}), 400
+    if not can_view_grades(user_id):
+        return jsonify({'error':'Not allowed to view this student\'s grades'}), 403
+    try:
+        as_of = datetime.fromisoformat(as_of_raw)
+    except ValueError:
+        return jsonify({'error':'as_of must be an ISO date or datetime (e.g. 2026-01-31)'}), 400
+    if as_of.tzinfo is not None:
+        as_of = as_of.astimezone(timezone.utc).replace(tzinfo=None)
+    if len(as_of_raw) == 10:
+        # a bare date means the end of that day
+        as_of = as_of.replace(hour=23, minute=59, second=59, microsecond=999999)
+    if not _derived_tables_ready:
+        return derived_tables_unavailable()
+    terms = gwa_by_term(user_id, as_of)
+    return jsonify({'user_id': user_id, 'as_of': as_of.isoformat(), 'gwa': terms[-1]['cumulative_gwa'] if terms else None, 'terms': terms})
+
+# API: search
+@app.route('/api/search', methods=['GET'])
+@login_required
+def api_search():
+    # ranked prefix search over the feed; admins can also search the student directory
+    q = (request.args.get('q') or '').strip()
+    if not q:
+        return jsonify({'error':'q query parameter required (e.g. ?q=calculus)'}), 400
+    page = max(request.args.get('page', 1, type=int), 1)
+    per_page = min(max(request.args.get('per_page', 20, type=int), 1), 50)
+    allowed = ['post', 'comment']
+    if Admin.query.filter_by(user_id=session['user_id']).first():
+        allowed.append('user')
+    requested = [t for t in (request.args.get('type') or '').split(',') if t] or allowed
+    kinds = [t for t in requested if t in allowed]
+    if not kinds:
+        return jsonify({'error':'type must be one of: ' + ', '.join(allowed)}), 400
+    if not _derived_tables_ready:
+        return derived_tables_unavailable()
+
+    hits = search_documents(q, kinds, limit=per_page + 1, offset=(page - 1) * per_page)
+    has_more = len(hits) > per_page
+    hits = hits[:per_page]
+
+    # hydrate each kind with a single query
+    ids = {kind: [ref_id for k, ref_id, _ in hits if k == kind] for kind in kinds}
+    rows = {'post': {}, 'comment': {}, 'user': {}}
+    if ids.get('post'):
+        rows['post'] = {p.id: p for p in Post.query.options(joinedload(Post.author)).filter(Post.id.in_(ids['post']))}
+    if ids.get('comment'):
+        rows['comment'] = {c.id: c for c in Comment.query.options(joinedload(Comment.author)).filter(Comment.id.in_(ids['comment']))}
+    if ids.get('user'):
+        rows['user'] = {u.id: u for u in User.query.filter(User.id.in_(ids['user']))}
+
+    results = []
+    for kind, ref_id, rank in hits:
+        obj = rows[kind].get(ref_id)
+        if obj is None:
+            continue
+        if kind == 'post':
+            item = {'content': obj.content, 'author': obj.author.name if obj.author else "Unknown", 'author_id': obj.user_id, 'timestamp': obj.timestamp.isoformat()}
+        elif kind == 'comment':
+            item = {'post_id': obj.post_id, 'content': obj.content, 'user': obj.author.name if obj.author else "Unknown", 'timestamp': obj.timestamp.isoformat()}
+        else:
+            item = {'school_id': obj.school_id, 'name': obj.name, 'department': obj.department, 'course': obj.course}
+        results.append({'type': kind, 'id': ref_id, 'rank': round(rank, 4), **item})
+    return jsonify({'query': q, 'page': page, 'per_page': per_page, 'has_more': has_more, 'results': results})
 
 # -------------------- Admin routes & APIs --------------------
 @app.route('/admin')
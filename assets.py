@@ -0,0 +1,92 @@
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+
+import brotli
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+DIST_DIR = os.path.join(STATIC_DIR, 'dist')
+MANIFEST_PATH = os.path.join(DIST_DIR, 'manifest.json')
+
+# Logical asset name -> source files (relative to static/), concatenated in order.
+# Keep the CSS order identical to the <link> order the templates used before bundling.
+BUNDLES = {
+    'css/layout.css': [
+        'css/main.css',
+        'css/components/_buttons.css',
+        'css/components/_input_fields.css',
+        'css/components/_sidebar.css',
+        'css/components/_dock.css',
+    ],
+    'js/main.js': ['js/main.js'],
+    'js/admin.js': ['js/admin.js'],
+}
+
+# Only files above this size get precompressed siblings; tiny files gain nothing.
+COMPRESS_MIN_BYTES = 256
+
+
+def minify_css(source):
+    """Conservative CSS minifier: strips comments and collapses whitespace."""
+    source = re.sub(r'/\*.*?\*/', '', source, flags=re.S)
+    source = re.sub(r'\s+', ' ', source)
+    source = re.sub(r'\s*([{};,>])\s*', r'\1', source)
+    source = re.sub(r':\s+', ':', source)
+    source = source.replace(';}', '}')
+    return source.strip()
+
+
+def load_manifest(path=MANIFEST_PATH):
+    """Returns the logical name -> fingerprinted path mapping, or {} if no build exists."""
+    try:
+        with open(path, encoding='utf-8') as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return {}
+
+
+def _read_bundle(name, sources):
+    parts = []
+    for rel in sources:
+        with open(os.path.join(STATIC_DIR, rel), encoding='utf-8') as fh:
+            parts.append(fh.read())
+    if name.endswith('.css'):
+        return '\n'.join(minify_css(p) for p in parts).encode('utf-8')
+    # JS is shipped unminified (no JS toolchain in this project), only concatenated.
+    return '\n;\n'.join(parts).encode('utf-8')
+
+
+def _write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as fh:
+        fh.write(data)
+
+
+def build(dist_dir=DIST_DIR):
+    """Builds every bundle into dist_dir with content-hashed names and .gz/.br siblings."""
+    if os.path.isdir(dist_dir):
+        shutil.rmtree(dist_dir)
+    manifest = {}
+    for name, sources in BUNDLES.items():
+        data = _read_bundle(name, sources)
+        digest = hashlib.sha256(data).hexdigest()[:12]
+        stem, ext = os.path.splitext(name)
+        hashed = f"{stem}.{digest}{ext}"
+        out = os.path.join(dist_dir, hashed)
+        _write(out, data)
+        if len(data) >= COMPRESS_MIN_BYTES:
+            # mtime=0 keeps the .gz output byte-identical across builds
+            _write(out + '.gz', gzip.compress(data, compresslevel=9, mtime=0))
+            _write(out + '.br', brotli.compress(data, quality=11))
+        manifest[name] = hashed
+        print(f'{name} -> dist/{hashed} ({len(data)} bytes)')
+    _write(os.path.join(dist_dir, 'manifest.json'), json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8'))
+    return manifest
+
+
+if __name__ == '__main__':
+    build(sys.argv[1] if len(sys.argv) > 1 else DIST_DIR)
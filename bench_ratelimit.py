@@ -0,0 +1,46 @@
+"""Rate-limit storage benchmark: cost per request of the shared SQLite store vs memory://.
+
+Usage: python bench_ratelimit.py [--requests N] [--clients N]
+
+Each simulated request hits the app's three-limit worst case (two default limits plus a
+route limit) for one of --clients distinct client addresses.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from limits import parse_many
+from limits.storage import storage_from_string
+from limits.strategies import FixedWindowRateLimiter
+
+import ratelimit_storage  # noqa: F401 - registers sqlite://
+
+LIMITS = parse_many("200 per day; 50 per hour; 5 per minute")
+
+
+def bench(uri, requests, clients):
+    limiter = FixedWindowRateLimiter(storage_from_string(uri))
+    start = time.perf_counter()
+    for i in range(requests):
+        client = f"10.0.{(i % clients) // 256}.{i % 256}"
+        for item in LIMITS:
+            limiter.hit(item, client)
+    return (time.perf_counter() - start) / requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--clients", type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        uris = ["memory://", "sqlite:///" + os.path.join(tmp, "ratelimit.db")]
+        for uri in uris:
+            per_request = bench(uri, args.requests, args.clients)
+            print(f"{uri.split(':')[0]:<8} {per_request * 1e6:8.1f} us per request ({len(LIMITS)} limits)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Startup benchmark: app import time and gunicorn time-to-first-response.
+
+Usage: python bench_startup.py [--runs N]
+
+Time-to-first-response is measured from spawning gunicorn (with gunicorn.conf.py)
+until GET / answers, with preload on and off.
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+TIMEOUT = 60
+
+
+def import_time():
+    code = 'import time; t = time.perf_counter(); import app; print(time.perf_counter() - t)'
+    out = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def time_to_first_response(preload):
+    port = free_port()
+    env = dict(os.environ, PORT=str(port), GUNICORN_PRELOAD='1' if preload else '0')
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, '-m', 'gunicorn', 'app:app'], cwd=ROOT, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        while time.perf_counter() - start < TIMEOUT:
+            if proc.poll() is not None:
+                raise RuntimeError(f'gunicorn exited with code {proc.returncode}')
+            try:
+                urllib.request.urlopen(f'http://127.0.0.1:{port}/', timeout=5).read()
+                return time.perf_counter() - start
+            except urllib.error.HTTPError:
+                # any HTTP answer means a worker is serving
+                return time.perf_counter() - start
+            except OSError:
+                time.sleep(0.01)
+        raise RuntimeError('gunicorn did not answer within %ss' % TIMEOUT)
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def report(label, samples):
+    ms = [s * 1000 for s in samples]
+    print(f'{label:<32} median {statistics.median(ms):8.1f} ms   min {min(ms):8.1f} ms   max {max(ms):8.1f} ms')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    report('import app', [import_time() for _ in range(args.runs)])
+    report('first response (preload)', [time_to_first_response(True) for _ in range(args.runs)])
+    report('first response (no preload)', [time_to_first_response(False) for _ in range(args.runs)])
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,6 @@
 import os
 import ssl
+import tempfile
 import certifi
 from dotenv import load_dotenv
 
@@ -53,5 +54,32 @@ class Config:
     SESSION_COOKIE_SAMESITE = os.getenv("SESSION_COOKIE_SAMESITE", "Lax")
     PERMANENT_SESSION_LIFETIME = 604800  # 7 days in seconds
 
+    # Fingerprinted static assets (see assets.py) are served with year-long immutable caching
+    ASSET_MAX_AGE = 31536000
+
+    # Per-worker in-memory grade store (grade_store.py) is fully reloaded at most this often
+    GRADE_STORE_RELOAD_SECONDS = int(os.getenv("GRADE_STORE_RELOAD_SECONDS", "3600"))
+    # ...and re-reads this many seconds of grade events on each refresh, to catch late commits
+    GRADE_STORE_EVENT_WINDOW_SECONDS = int(os.getenv("GRADE_STORE_EVENT_WINDOW_SECONDS", "30"))
+
+    # Departments/courses catalog is cached per worker for this long
+    CATALOG_CACHE_SECONDS = int(os.getenv("CATALOG_CACHE_SECONDS", "300"))
+
+    # Worker warmup (see gunicorn.conf.py): open pool connections and prime caches on boot
+    WARMUP_ON_START = os.getenv("WARMUP_ON_START", "1").lower() in ("1", "true", "yes")
+    WARMUP_POOL_CONNECTIONS = int(os.getenv("WARMUP_POOL_CONNECTIONS", "2"))
+
+    # Rate limiting. "sqlite:///<path>" (ratelimit_storage.py) shares counters between all
+    # gunicorn workers on the instance; "memory://" keeps separate counters per worker.
+    RATELIMIT_STORAGE_URI = os.getenv(
+        "RATELIMIT_STORAGE_URI",
+        "sqlite:///" + os.path.join(tempfile.gettempdir(), "gwacalculator-ratelimit.db"),
+    )
+    # Only passed to the sqlite:// storage
+    RATELIMIT_STORAGE_OPTIONS = {
+        "max_keys": int(os.getenv("RATELIMIT_MAX_KEYS", "100000")),
+        "purge_every": int(os.getenv("RATELIMIT_PURGE_EVERY", "1000")),
+    }
+
     # CORS Settings
     CORS_ALLOWED_ORIGINS = os.getenv("CORS_ALLOWED_ORIGINS", "*").split(",")
@@ -0,0 +1,252 @@
+import math
+import threading
+from array import array
+from bisect import bisect_left
+from collections import deque
+
+
+class GradeStore:
+    """Compact, column-per-field in-memory copy of every SubjectGrade row.
+
+    Rows are kept sorted by grade id (new grades always get higher ids), so a grade is
+    found by binary search instead of a per-row dict. Deleted rows are tombstoned with
+    user index -1 and dropped on the next compaction. A row costs ~36 bytes, against
+    several KB for an ORM object with its relationship state. The aggregates behind
+    summary() and failure_rates() (per-user unit/point sums, per-subject counters) are
+    kept in arrays and adjusted in O(1) as each row is added, changed or removed.
+    """
+
+    # compact once this fraction of rows are tombstones
+    COMPACT_RATIO = 0.25
+    # terms outside the column's range (rows stored before year/semester were validated)
+    # are kept as UNKNOWN_TERM rather than failing the whole load
+    MAX_TERM = 2 ** 31 - 1
+    UNKNOWN_TERM = -1
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.clear()
+
+    def clear(self):
+        self.grade_ids = array('q')
+        self.user_idx = array('i')
+        self.units = array('d')
+        self.grades = array('d')
+        self.terms = array('i')  # year * 4 + semester
+        self.subject_ids = array('i')
+        self.user_ids = array('q')  # user index -> user id
+        self.subjects = []  # subject id -> name
+        self._user_index = {}
+        self._subject_index = {}
+        self.dead = 0
+        self.last_event_id = 0
+        self.loaded_at = None
+        # event ids applied above the replay floor, and (time, last_event_id) per apply_events call
+        self._applied = set()
+        self._checkpoints = deque()
+        self._floor = 0
+        # running aggregates, indexed by user index / subject id
+        self.user_units = array('d')
+        self.user_points = array('d')
+        self.user_graded = array('i')  # rows counted in user_units/user_points
+        self.subject_total = array('q')
+        self.subject_failed = array('q')
+        self.total = 0
+        self.failed = 0
+        self.gwa_users = 0  # users with graded units
+        self.gwa_milli_sum = 0  # sum of those users' GWAs, rounded to 3 places, in thousandths
+        self._counting = True
+
+    def __len__(self):
+        return len(self.grade_ids) - self.dead
+
+    def _user(self, user_id):
+        idx = self._user_index.get(user_id)
+        if idx is None:
+            idx = self._user_index[user_id] = len(self.user_ids)
+            self.user_ids.append(user_id)
+            self.user_units.append(0.0)
+            self.user_points.append(0.0)
+            self.user_graded.append(0)
+        return idx
+
+    def _subject(self, name):
+        idx = self._subject_index.get(name)
+        if idx is None:
+            idx = self._subject_index[name] = len(self.subjects)
+            self.subjects.append(name)
+            self.subject_total.append(0)
+            self.subject_failed.append(0)
+        return idx
+
+    def _find(self, grade_id):
+        row = bisect_left(self.grade_ids, grade_id)
+        if row < len(self.grade_ids) and self.grade_ids[row] == grade_id:
+            return row
+        return None
+
+    def load(self, rows, last_event_id, loaded_at=None):
+        """Replaces the contents with `rows` of (id, user_id, subject, units, grade, year, semester), sorted by id."""
+        self.clear()
+        # count once after the bulk insert rather than row by row
+        self._counting = False
+        try:
+            for row in rows:
+                self.upsert(*row)
+        finally:
+            self._counting = True
+            self._recount()
+        self.last_event_id = self._floor = last_event_id
+        self.loaded_at = loaded_at
+
+    def _user_gwa_milli(self, u):
+        if self.user_graded[u] <= 0 or self.user_units[u] <= 0:
+            return None
+        return round(round(self.user_points[u] / self.user_units[u], 3) * 1000)
+
+    def _recount(self):
+        """Rebuilds every aggregate from the live rows in one pass."""
+        n_users, n_subjects = len(self.user_ids), len(self.subjects)
+        self.user_units = array('d', bytes(8 * n_users))
+        self.user_points = array('d', bytes(8 * n_users))
+        self.user_graded = array('i', bytes(4 * n_users))
+        self.subject_total = array('q', bytes(8 * n_subjects))
+        self.subject_failed = array('q', bytes(8 * n_subjects))
+        self.total = self.failed = 0
+        for u, units, grade, subject in zip(self.user_idx, self.units, self.grades, self.subject_ids):
+            if u < 0:
+                continue
+            self.total += 1
+            self.subject_total[subject] += 1
+            if grade > 3.0:
+                self.failed += 1
+                self.subject_failed[subject] += 1
+            if units > 0 and grade > 0:
+                self.user_graded[u] += 1
+                self.user_units[u] += units
+                self.user_points[u] += units * grade
+        gwas = [milli for milli in map(self._user_gwa_milli, range(n_users)) if milli is not None]
+        self.gwa_users, self.gwa_milli_sum = len(gwas), sum(gwas)
+
+    def _count(self, row, sign):
+        """Adds (sign=1) or removes (sign=-1) a live row's contribution to the aggregates."""
+        if not self._counting:
+            return
+        u, units, grade, subject = self.user_idx[row], self.units[row], self.grades[row], self.subject_ids[row]
+        failed = 1 if grade > 3.0 else 0  # NaN compares false
+        self.total += sign
+        self.failed += sign * failed
+        self.subject_total[subject] += sign
+        self.subject_failed[subject] += sign * failed
+        if units > 0 and grade > 0:
+            old = self._user_gwa_milli(u)
+            self.user_graded[u] += sign
+            if self.user_graded[u]:
+                self.user_units[u] += sign * units
+                self.user_points[u] += sign * units * grade
+            else:
+                # reset exactly so float residue never leaves a phantom GWA behind
+                self.user_units[u] = self.user_points[u] = 0.0
+            new = self._user_gwa_milli(u)
+            if old is not None:
+                self.gwa_users -= 1
+                self.gwa_milli_sum -= old
+            if new is not None:
+                self.gwa_users += 1
+                self.gwa_milli_sum += new
+
+    def upsert(self, grade_id, user_id, subject, units, grade, year, semester):
+        term = (year or 0) * 4 + (semester or 0)
+        if not 0 <= term <= self.MAX_TERM:
+            term = self.UNKNOWN_TERM
+        values = (
+            self._user(user_id),
+            math.nan if units is None else units,
+            math.nan if grade is None else grade,
+            term,
+            self._subject(subject),
+        )
+        row = self._find(grade_id)
+        if row is None:
+            if self.grade_ids and grade_id < self.grade_ids[-1]:
+                # out-of-order id (e.g. a late commit): insert in place to keep ids sorted
+                row = bisect_left(self.grade_ids, grade_id)
+                for col, value in zip(self._columns(), (grade_id,) + values):
+                    col.insert(row, value)
+                self._count(row, 1)
+                return
+            self.grade_ids.append(grade_id)
+            row = len(self.grade_ids) - 1
+            self.user_idx.append(0)
+            self.units.append(0.0)
+            self.grades.append(0.0)
+            self.terms.append(0)
+            self.subject_ids.append(0)
+        elif self.user_idx[row] < 0:
+            self.dead -= 1
+        else:
+            self._count(row, -1)
+        self.user_idx[row], self.units[row], self.grades[row], self.terms[row], self.subject_ids[row] = values
+        self._count(row, 1)
+
+    def delete(self, grade_id):
+        row = self._find(grade_id)
+        if row is not None and self.user_idx[row] >= 0:
+            self._count(row, -1)
+            self.user_idx[row] = -1
+            self.dead += 1
+            if self.dead > len(self.grade_ids) * self.COMPACT_RATIO:
+                self.compact()
+
+    def replay_floor(self, now, window):
+        """Event id to re-read from: last_event_id as it was `window` seconds ago.
+
+        Events above it are re-read on every refresh and the ones already applied skipped,
+        so an event committed after a higher id (a slow transaction) is still picked up if
+        it lands within `window` seconds.
+        """
+        while self._checkpoints and self._checkpoints[0][0] <= now - window:
+            self._floor = self._checkpoints.popleft()[1]
+        self._applied = {event_id for event_id in self._applied if event_id > self._floor}
+        return self._floor
+
+    def apply_events(self, events, now=None):
+        """Applies GradeEvent rows of (id, action, grade_id, user_id, subject, units, grade, year, semester) in id order.
+
+        Events already applied since the replay floor are skipped. Pass `now` to record a
+        checkpoint for replay_floor().
+        """
+        for event_id, action, grade_id, *values in events:
+            if event_id in self._applied:
+                continue
+            if action == 'delete':
+                self.delete(grade_id)
+            else:
+                self.upsert(grade_id, *values)
+            self._applied.add(event_id)
+            self.last_event_id = max(self.last_event_id, event_id)
+        if now is not None:
+            self._checkpoints.append((now, self.last_event_id))
+
+    def _columns(self):
+        return (self.grade_ids, self.user_idx, self.units, self.grades, self.terms, self.subject_ids)
+
+    def compact(self):
+        keep = [row for row, u in enumerate(self.user_idx) if u >= 0]
+        for col in self._columns():
+            col[:] = array(col.typecode, (col[row] for row in keep))
+        self.dead = 0
+
+    def summary(self):
+        """Average per-student GWA and overall failure rate, as /api/analytics reports them."""
+        return {
+            'average_gwa': round(self.gwa_milli_sum / 1000 / self.gwa_users, 3) if self.gwa_users else None,
+            'failure_rate': (self.failed / self.total) if self.total > 0 else None,
+        }
+
+    def failure_rates(self):
+        """{subject: {total, failed, failure_rate}} over every live grade."""
+        return {
+            name: {'total': t, 'failed': f, 'failure_rate': round(f / t, 3)}
+            for name, t, f in zip(self.subjects, self.subject_total, self.subject_failed) if t > 0
+        }
@@ -0,0 +1,27 @@
+import os
+
+# Picked up automatically by `gunicorn app:app` from the project root.
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+threads = int(os.getenv("WEB_THREADS", "2"))
+
+# Import app.py (and build config.py's SSL context) once in the master; workers fork from it.
+preload_app = os.getenv("GUNICORN_PRELOAD", "1").lower() in ("1", "true", "yes")
+
+
+def post_fork(server, worker):
+    if not server.cfg.preload_app:
+        return
+    from app import app, db
+
+    # Pooled connections must never be shared across processes. close=False drops the
+    # inherited pool without closing sockets that still belong to the master.
+    with app.app_context():
+        db.engine.dispose(close=False)
+
+
+def post_worker_init(worker):
+    from app import app, warmup
+
+    if app.config["WARMUP_ON_START"]:
+        warmup()
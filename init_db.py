@@ -1,5 +1,5 @@
 import os
-from app import app, db, Department, Course, User, Post, Admin
+from app import app, db, Department, Course, User, Post, Admin, ensure_search_index, ensure_grade_history
 
 def seed():
     with app.app_context():
@@ -7,6 +7,8 @@ def seed():
         if reset:
             db.drop_all()
         db.create_all()
+        ensure_search_index(rebuild=reset)
+        ensure_grade_history()
 
         if not Department.query.filter_by(name='COTE').first():
             cote = Department(name='COTE')
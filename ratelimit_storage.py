@@ -0,0 +1,102 @@
+import os
+import sqlite3
+import threading
+import time
+
+from limits.storage import Storage
+
+
+class SQLiteStorage(Storage):
+    """Fixed-window rate-limit counters in a local SQLite file, shared by every worker.
+
+    Select it with ``sqlite:///relative/path.db`` or ``sqlite:////absolute/path.db``
+    (same path rules as SQLAlchemy). Each hit is one UPSERT in WAL mode with
+    synchronous=OFF, so no external service is needed and a hit costs tens of
+    microseconds. Expired windows are deleted in batches every ``purge_every`` hits;
+    if more than ``max_keys`` windows are still live after a purge, the ones closest
+    to expiring are dropped, which keeps the file bounded under many client IPs.
+    """
+
+    STORAGE_SCHEME = ["sqlite"]
+
+    def __init__(self, uri, wrap_exceptions=False, max_keys=100000, purge_every=1000, **options):
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        self.path = uri[len("sqlite:///"):] or ":memory:"
+        self.max_keys = int(max_keys)
+        self.purge_every = int(purge_every)
+        self._local = threading.local()
+        self._hits = 0
+
+    @property
+    def base_exceptions(self):
+        return sqlite3.Error
+
+    @property
+    def _conn(self):
+        # one connection per thread, reopened after fork so workers never share the master's
+        local = self._local
+        if getattr(local, "pid", None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS ratelimit ("
+                "key TEXT PRIMARY KEY, count INTEGER NOT NULL, expiry REAL NOT NULL) WITHOUT ROWID"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_ratelimit_expiry ON ratelimit (expiry)")
+            local.conn, local.pid = conn, os.getpid()
+        return local.conn
+
+    def incr(self, key, expiry, elastic_expiry=False, amount=1):
+        now = time.time()
+        # a window that has already expired restarts at `amount` with a fresh expiry
+        count = self._conn.execute(
+            "INSERT INTO ratelimit (key, count, expiry) VALUES (?, ?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET "
+            "count = CASE WHEN expiry <= ? THEN excluded.count ELSE count + excluded.count END, "
+            "expiry = CASE WHEN expiry <= ? OR ? THEN excluded.expiry ELSE expiry END "
+            "RETURNING count",
+            (key, amount, now + expiry, now, now, bool(elastic_expiry)),
+        ).fetchone()[0]
+        self._hits += 1
+        if self._hits >= self.purge_every:
+            self._hits = 0
+            self.purge(now)
+        return count
+
+    def purge(self, now=None):
+        """Deletes expired windows, then trims to max_keys. Returns the number of rows removed."""
+        conn = self._conn
+        removed = conn.execute("DELETE FROM ratelimit WHERE expiry <= ?", (now or time.time(),)).rowcount
+        excess = conn.execute("SELECT COUNT(*) FROM ratelimit").fetchone()[0] - self.max_keys
+        if excess > 0:
+            removed += conn.execute(
+                "DELETE FROM ratelimit WHERE key IN (SELECT key FROM ratelimit ORDER BY expiry LIMIT ?)", (excess,)
+            ).rowcount
+        return removed
+
+    def get(self, key):
+        row = self._conn.execute(
+            "SELECT count FROM ratelimit WHERE key = ? AND expiry > ?", (key, time.time())
+        ).fetchone()
+        return row[0] if row else 0
+
+    def get_expiry(self, key):
+        now = time.time()
+        row = self._conn.execute(
+            "SELECT expiry FROM ratelimit WHERE key = ? AND expiry > ?", (key, now)
+        ).fetchone()
+        return row[0] if row else now
+
+    def check(self):
+        try:
+            self._conn.execute("SELECT 1")
+            return True
+        except sqlite3.Error:
+            return False
+
+    def reset(self):
+        return self._conn.execute("DELETE FROM ratelimit").rowcount
+
+    def clear(self, key):
+        self._conn.execute("DELETE FROM ratelimit WHERE key = ?", (key,))
@@ -1,6 +1,10 @@
 document.addEventListener('DOMContentLoaded', () => {
   // No longer used: GWA Feedback logic
 
+  // Dashboard data embedded by the server (same payload as /api/bootstrap)
+  const bootstrapEl = document.getElementById('bootstrapData');
+  const bootstrap = bootstrapEl ? JSON.parse(bootstrapEl.textContent) : null;
+
   // Navigation Logic (SIS Style)
   const sidebarLinks = document.querySelectorAll('.sidebar-link');
   const viewSections = document.querySelectorAll('.view-section');
@@ -88,16 +92,21 @@ document.addEventListener('DOMContentLoaded', () => {
 
   // GWA Chart Logic
   let gwaChart;
+  let timelineCache = bootstrap ? bootstrap.timeline : null;
   async function initGwaChart() {
     const canvas = document.getElementById('gwaChart');
     if (!canvas) return;
 
-    const res = await fetch(`/api/analytics/user-timeline?user_id=${window.userId}`);
-    if (!res.ok) return;
-    const data = await res.json();
+    if (!timelineCache) {
+      const res = await fetch(`/api/analytics/gwa_trends?user_id=${window.userId}`);
+      if (!res.ok) return;
+      timelineCache = (await res.json()).timeline;
+    }
+    const data = { timeline: timelineCache };
 
     const ctx = canvas.getContext('2d');
-    const labels = data.timeline.map(item => new Date(item.timestamp).toLocaleDateString());
+    // points are in term order, so label them by term rather than by edit time
+    const labels = data.timeline.map(item => `Y${item.year} S${item.semester}`);
     const values = data.timeline.map(item => item.gwa);
 
     if (gwaChart) gwaChart.destroy();
@@ -137,9 +146,9 @@ document.addEventListener('DOMContentLoaded', () => {
   const gwaEl = document.getElementById('gwa');
   const overviewGwaSpan = document.getElementById('overview-gwa');
 
+  // The feed is rendered once at the end of setup, after its elements are bound
   if (gwaEl || overviewGwaSpan) {
     initGwaChart();
-    refreshPosts();
   }
 
     // Post elements
@@ -148,8 +157,8 @@ document.addEventListener('DOMContentLoaded', () => {
   const postContent = document.getElementById('postContent');
   const postsDiv = document.getElementById('posts');
 
-  // Simple client-side cache
-  let postsCache = null;
+  // Simple client-side cache, seeded from the bootstrap payload
+  let postsCache = bootstrap ? bootstrap.feed : null;
 
   async function refreshPosts(force = false) {
     if (!postsDiv) return;
@@ -362,6 +371,7 @@ document.addEventListener('DOMContentLoaded', () => {
         }
         if (gwaSpan) gwaSpan.textContent = json.gwa || '—';
         if (json.gwa) {
+          timelineCache = null;
           initGwaChart();
         }
         // Refresh honors status (reload or fetch)